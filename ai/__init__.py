@@ -1,3 +1,17 @@
 """Helpers for interacting with the Flatlogic AI proxy from Django code."""
 
-from .local_ai_api import LocalAIApi, create_response, request, decode_json_from_response  # noqa: F401
+# The client is imported on first attribute access (PEP 562) so management
+# commands and app startup don't pay for http.client/ssl until an AI call.
+__all__ = ["LocalAIApi", "create_response", "request", "decode_json_from_response"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import local_ai_api
+
+        return getattr(local_ai_api, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
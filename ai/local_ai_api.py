@@ -30,30 +30,119 @@ Usage (inside the Django workspace):
 
 The helper automatically injects the project UUID header and falls back to
 reading executor/.env if environment variables are missing.
+
+Successful responses are kept in an in-process exact-match cache keyed by
+the full payload, endpoint path, extra headers and TLS mode; pass
+``{"cache_bypass": True}`` in options to skip it or ``{"cache_ttl": seconds}``
+to change the lifetime (default 3600).
+Returned payloads carry ``"cache": "HIT"`` or ``"cache": "MISS"``.
+``{"semantic_cache": True}`` (or AI_SEMANTIC_CACHE=true) also matches
+near-duplicate prompts, see ai/semantic_cache.py; such hits are marked
+``"cache": "SEMANTIC_HIT"``. ``{"no_cache": True}`` disables both caches.
+Concurrent identical calls share one upstream request; the callers that
+waited on it get ``"cache": "COALESCED"``.
+
+Set AI_STATUS_WAIT (seconds) when the proxy supports long-polling status
+checks; it is forwarded as ``?wait=`` on every status request.
+
+Payloads are encoded and decoded with orjson when it is installed, falling
+back to the standard json module otherwise.
 """
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import concurrent.futures
+import copy
+import functools
+import hashlib
+import http.client
 import json
 import os
+import re
+import threading
 import time
 import ssl
-from typing import Any, Dict, Iterable, Optional
-from urllib import error as urlerror
+import warnings
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
 from urllib import request as urlrequest
+from urllib.parse import SplitResult, unquote, urljoin, urlsplit
+
+from . import semantic_cache
 
 __all__ = [
     "LocalAIApi",
     "create_response",
+    "acreate_response",
     "request",
     "fetch_status",
     "await_response",
+    "aawait_response",
     "extract_text",
     "decode_json_from_response",
 ]
 
 
-_CONFIG_CACHE: Optional[Dict[str, Any]] = None
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.IGNORECASE | re.DOTALL)
+_JSON_DECODER = json.JSONDecoder()
+
+_ENV_LOADED = False
+_ENV_QUOTE_RE = re.compile(r"^['\"]|['\"]$")
+
+_RESPONSE_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_RESPONSE_CACHE_LOCK = threading.Lock()
+_RESPONSE_CACHE_MAX_ENTRIES = 256
+_RESPONSE_CACHE_DEFAULT_TTL = 3600
+
+# Identical requests already on the wire, keyed like _RESPONSE_CACHE.
+_INFLIGHT: Dict[str, concurrent.futures.Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+_SEMANTIC_DEFAULT_THRESHOLD = 0.92
+_TEXT_BLOCK_TYPES = {"input_text", "text"}
+
+# (exact-match key, (semantic namespace, embedding)); either may be None.
+_CacheKeys = Tuple[Optional[str], Optional[Tuple[str, semantic_cache.Vector]]]
+
+_POLL_INITIAL_DELAY = 0.25
+_POLL_BACKOFF_FACTOR = 1.8
+
+_REDIRECT_CODES = {301, 302, 303, 307, 308}
+_MAX_REDIRECTS = 10  # urllib's HTTPRedirectHandler.max_redirections
+_USER_AGENT = f"Python-urllib/{urlrequest.__version__}"
+
+# Per-thread keep-alive connections, keyed by (scheme, netloc, verify_tls, proxy).
+_CONNECTIONS = threading.local()
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+if orjson is not None:
+    def _dumps(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers beyond 64 bits; json handles what orjson refuses.
+            return _json_dumps(obj)
+
+    def _loads(data: Any) -> Any:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # e.g. NaN/Infinity, which json.loads accepts.
+            return json.loads(data)
+else:
+    _dumps = _json_dumps
+    _loads = json.loads
 
 
 class LocalAIApi:
@@ -63,6 +152,11 @@ class LocalAIApi:
     def create_response(params: Dict[str, Any], options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         return create_response(params, options or {})
 
+    @staticmethod
+    async def acreate_response(params: Dict[str, Any],
+                               options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await acreate_response(params, options or {})
+
     @staticmethod
     def request(path: Optional[str] = None, payload: Optional[Dict[str, Any]] = None,
                 options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -80,38 +174,230 @@ class LocalAIApi:
 def create_response(params: Dict[str, Any], options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Signature compatible with the OpenAI Responses API."""
     options = options or {}
-    payload = dict(params)
+    payload, error = _prepare_payload(params)
+    if error is not None:
+        return error
 
+    if options.get("headers"):
+        # Parse "Name: value" strings once instead of on every status poll.
+        options = {**options, "headers": _parse_headers(options["headers"])}
+
+    cache_keys, cached = _lookup_cached(payload, options)
+    if cached is not None:
+        return cached
+
+    while True:
+        future, owner = _claim_inflight(cache_keys[0])
+        if owner:
+            break
+        try:
+            shared = future.result(timeout=_inflight_timeout(options))
+        except concurrent.futures.TimeoutError:
+            return _poll_timeout_result()
+        if shared is not None:
+            return _coalesced_result(shared)
+        # The owner was cancelled before it finished; take the request over.
+
+    try:
+        result = _remember_result(cache_keys, _create_response_uncached(payload, options), options)
+    except Exception as exc:
+        _settle_inflight(cache_keys[0], future, exc=exc)
+        raise
+    except BaseException:
+        # Interrupted: let a waiter take over rather than re-raise this in its thread.
+        _settle_inflight(cache_keys[0], future)
+        raise
+    _settle_inflight(cache_keys[0], future, result)
+    return result
+
+
+async def acreate_response(params: Dict[str, Any], options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Async variant of create_response for views that fan out several AI requests.
+
+    HTTP calls run in worker threads (asyncio.to_thread) while the waits
+    between status checks happen on the event loop, so a thread is held only
+    while a call is on the wire. With AI_STATUS_WAIT set, every status call
+    is a long-poll that holds its thread for up to that many seconds, so each
+    outstanding request occupies a thread for most of the polling period and
+    concurrency is capped by the loop's default executor
+    (min(32, os.cpu_count() + 4) threads); install a larger one with
+    loop.set_default_executor() when fanning out more requests than that.
+    """
+    options = options or {}
+    payload, error = _prepare_payload(params)
+    if error is not None:
+        return error
+
+    if options.get("headers"):
+        # Parse "Name: value" strings once instead of on every status poll.
+        options = {**options, "headers": _parse_headers(options["headers"])}
+
+    if _semantic_cache_enabled(options):
+        # Embedding the prompt is CPU-bound; keep it off the event loop.
+        cache_keys, cached = await asyncio.to_thread(_lookup_cached, payload, options)
+    else:
+        cache_keys, cached = _lookup_cached(payload, options)
+    if cached is not None:
+        return cached
+
+    while True:
+        future, owner = _claim_inflight(cache_keys[0])
+        if owner:
+            break
+        try:
+            # shield() keeps a timed-out waiter from cancelling the shared future.
+            shared = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)),
+                                            _inflight_timeout(options))
+        except asyncio.TimeoutError:
+            return _poll_timeout_result()
+        if shared is not None:
+            return _coalesced_result(shared)
+        # The owner was cancelled before it finished; take the request over.
+
+    try:
+        result = _remember_result(cache_keys, await _acreate_response_uncached(payload, options), options)
+    except Exception as exc:
+        _settle_inflight(cache_keys[0], future, exc=exc)
+        raise
+    except BaseException:
+        # Cancelling this caller must not hand its CancelledError to the waiters.
+        _settle_inflight(cache_keys[0], future)
+        raise
+    _settle_inflight(cache_keys[0], future, result)
+    return result
+
+
+def _prepare_payload(params: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    payload = dict(params)
     if not isinstance(payload.get("input"), list) or not payload["input"]:
-        return {
+        return payload, {
             "success": False,
             "error": "input_missing",
             "message": 'Parameter "input" is required and must be a non-empty list.',
         }
 
-    cfg = _config()
     if not payload.get("model"):
-        payload["model"] = cfg["default_model"]
+        payload["model"] = _config()["default_model"]
+    return payload, None
+
+
+def _lookup_cached(payload: Dict[str, Any],
+                   options: Dict[str, Any]) -> Tuple[_CacheKeys, Optional[Dict[str, Any]]]:
+    """Check the exact-match cache, then the semantic cache when enabled."""
+    if options.get("no_cache"):
+        return (None, None), None
+
+    cache_key = None if options.get("cache_bypass") else _cache_key(payload, options)
+    if cache_key is not None:
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            cached["cache"] = "HIT"
+            return (cache_key, None), cached
+
+    semantic_key = _semantic_key(payload, options) if _semantic_cache_enabled(options) else None
+    if semantic_key is not None:
+        namespace, vector = semantic_key
+        threshold = float(options.get("sim_threshold", _SEMANTIC_DEFAULT_THRESHOLD))
+        cached = semantic_cache.default_cache().get(namespace, vector, threshold)
+        if cached is not None:
+            cached["cache"] = "SEMANTIC_HIT"
+            return (cache_key, semantic_key), cached
+    return (cache_key, semantic_key), None
+
+
+def _remember_result(cache_keys: _CacheKeys, result: Dict[str, Any],
+                     options: Dict[str, Any]) -> Dict[str, Any]:
+    cache_key, semantic_key = cache_keys
+    if cache_key is None and semantic_key is None:
+        return result
+
+    ttl = int(options.get("cache_ttl", _RESPONSE_CACHE_DEFAULT_TTL))
+    if result.get("success") and ttl > 0 and not _has_tool_calls(result):
+        if cache_key is not None:
+            _cache_put(cache_key, result, ttl)
+        if semantic_key is not None:
+            semantic_cache.default_cache().put(semantic_key[0], semantic_key[1], result, ttl)
+    result["cache"] = "MISS"
+    return result
+
+
+def _claim_inflight(cache_key: Optional[str]) -> Tuple[Optional[concurrent.futures.Future], bool]:
+    """Return (future, owner); only the owner performs the request, the rest wait on it."""
+    if cache_key is None:
+        return None, True
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(cache_key)
+        if future is not None:
+            return future, False
+        future = concurrent.futures.Future()
+        _INFLIGHT[cache_key] = future
+        return future, True
+
+
+def _settle_inflight(cache_key: Optional[str], future: Optional[concurrent.futures.Future],
+                     result: Optional[Dict[str, Any]] = None,
+                     exc: Optional[BaseException] = None) -> None:
+    """Release the key and wake the waiters; a None result tells them to claim it themselves."""
+    if future is None:
+        return
+    with _INFLIGHT_LOCK:
+        if _INFLIGHT.get(cache_key) is future:
+            del _INFLIGHT[cache_key]
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(copy.deepcopy(result))
+
+
+def _coalesced_result(shared: Dict[str, Any]) -> Dict[str, Any]:
+    result = copy.deepcopy(shared)
+    result["cache"] = "COALESCED"
+    return result
+
 
+def _inflight_timeout(options: Dict[str, Any]) -> int:
+    """Upper bound on how long the owner of a coalesced request can take."""
+    cfg = _config()
+    _, window = _poll_window(_poll_options(options))
+    # Each call may be retried once on a stale keep-alive connection.
+    post_timeout = 2 * _call_timeout(options.get("timeout"), cfg)
+    status_timeout = 2 * _status_call_timeout(options.get("timeout"), cfg)
+    return post_timeout + window + status_timeout
+
+
+def _create_response_uncached(payload: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
     initial = request(options.get("path"), payload, options)
     if not initial.get("success"):
         return initial
 
     data = initial.get("data")
     if isinstance(data, dict) and "ai_request_id" in data:
-        ai_request_id = data["ai_request_id"]
-        poll_timeout = int(options.get("poll_timeout", 300))
-        poll_interval = int(options.get("poll_interval", 5))
-        return await_response(ai_request_id, {
-            "interval": poll_interval,
-            "timeout": poll_timeout,
-            "headers": options.get("headers"),
-            "timeout_per_call": options.get("timeout"),
-        })
+        return await_response(data["ai_request_id"], _poll_options(options))
+
+    return initial
+
+
+async def _acreate_response_uncached(payload: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+    initial = await asyncio.to_thread(request, options.get("path"), payload, options)
+    if not initial.get("success"):
+        return initial
+
+    data = initial.get("data")
+    if isinstance(data, dict) and "ai_request_id" in data:
+        return await aawait_response(data["ai_request_id"], _poll_options(options))
 
     return initial
 
 
+def _poll_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "interval": int(options.get("poll_interval", 5)),
+        "timeout": int(options.get("poll_timeout", 300)),
+        "headers": options.get("headers"),
+        "timeout_per_call": options.get("timeout"),
+    }
+
+
 def request(path: Optional[str], payload: Dict[str, Any], options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Perform a raw request to the AI proxy."""
     cfg = _config()
@@ -137,23 +423,11 @@ def request(path: Optional[str], payload: Dict[str, Any], options: Optional[Dict
         payload["project_uuid"] = project_uuid
 
     url = _build_url(resolved_path, cfg["base_url"])
-    opt_timeout = options.get("timeout")
-    timeout = int(cfg["timeout"] if opt_timeout is None else opt_timeout)
-    verify_tls = options.get("verify_tls", cfg["verify_tls"])
-
-    headers: Dict[str, str] = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        cfg["project_header"]: project_uuid,
-    }
-    extra_headers = options.get("headers")
-    if isinstance(extra_headers, Iterable):
-        for header in extra_headers:
-            if isinstance(header, str) and ":" in header:
-                name, value = header.split(":", 1)
-                headers[name.strip()] = value.strip()
+    timeout = _call_timeout(options.get("timeout"), cfg)
+    verify_tls = _resolve_verify_tls(options.get("verify_tls"), cfg)
 
-    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    headers = _merge_headers(_base_headers(True), options.get("headers"))
+    body = _dumps(payload)
     return _http_request(url, "POST", body, headers, timeout, verify_tls)
 
 
@@ -173,68 +447,111 @@ def fetch_status(ai_request_id: Any, options: Optional[Dict[str, Any]] = None) -
     status_path = _resolve_status_path(ai_request_id, cfg)
     url = _build_url(status_path, cfg["base_url"])
 
-    opt_timeout = options.get("timeout")
-    timeout = int(cfg["timeout"] if opt_timeout is None else opt_timeout)
-    verify_tls = options.get("verify_tls", cfg["verify_tls"])
-
-    headers: Dict[str, str] = {
-        "Accept": "application/json",
-        cfg["project_header"]: project_uuid,
-    }
-    extra_headers = options.get("headers")
-    if isinstance(extra_headers, Iterable):
-        for header in extra_headers:
-            if isinstance(header, str) and ":" in header:
-                name, value = header.split(":", 1)
-                headers[name.strip()] = value.strip()
+    timeout = _status_call_timeout(options.get("timeout"), cfg)
+    if cfg["status_wait"] > 0:
+        # Long-poll: the proxy holds the request open until the status changes.
+        url = f"{url}?wait={cfg['status_wait']}"
+    verify_tls = _resolve_verify_tls(options.get("verify_tls"), cfg)
 
+    headers = _merge_headers(_base_headers(False), options.get("headers"))
     return _http_request(url, "GET", None, headers, timeout, verify_tls)
 
 
 def await_response(ai_request_id: Any, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """Poll status endpoint until the request is complete or timed out."""
+    """Poll status endpoint until the request is complete or timed out.
+
+    Checks start 250 ms apart and back off exponentially up to ``interval``
+    seconds, so short requests are picked up almost as soon as they finish.
+    """
+    options = options or {}
+    interval, deadline, status_options = _poll_plan(options)
+    delay = _POLL_INITIAL_DELAY
+
+    while True:
+        result = _poll_result(fetch_status(ai_request_id, status_options))
+        if result is not None:
+            return result
+
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return _poll_timeout_result()
+        time.sleep(min(delay, remaining))
+        delay = min(delay * _POLL_BACKOFF_FACTOR, interval)
+
+
+async def aawait_response(ai_request_id: Any, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Async variant of await_response; sleeps on the event loop between checks.
+
+    Each status call runs in a worker thread, for up to AI_STATUS_WAIT
+    seconds when long-polling (see acreate_response).
+    """
     options = options or {}
+    interval, deadline, status_options = _poll_plan(options)
+    delay = _POLL_INITIAL_DELAY
+
+    while True:
+        status_resp = await asyncio.to_thread(fetch_status, ai_request_id, status_options)
+        result = _poll_result(status_resp)
+        if result is not None:
+            return result
+
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return _poll_timeout_result()
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * _POLL_BACKOFF_FACTOR, interval)
+
+
+def _poll_plan(options: Dict[str, Any]) -> Tuple[int, float, Dict[str, Any]]:
+    interval, window = _poll_window(options)
+    deadline = time.time() + window
+    status_options = {
+        "headers": options.get("headers"),
+        "timeout": options.get("timeout_per_call"),
+        "verify_tls": options.get("verify_tls"),
+    }
+    return interval, deadline, status_options
+
+
+def _poll_window(options: Dict[str, Any]) -> Tuple[int, int]:
+    """Return (interval, seconds to keep polling) for await_response options."""
     timeout = int(options.get("timeout", 300))
     interval = int(options.get("interval", 5))
     if interval <= 0:
         interval = 5
-    per_call_timeout = options.get("timeout_per_call")
+    return interval, max(timeout, interval)
 
-    deadline = time.time() + max(timeout, interval)
 
-    while True:
-        status_resp = fetch_status(ai_request_id, {
-            "headers": options.get("headers"),
-            "timeout": per_call_timeout,
-            "verify_tls": options.get("verify_tls"),
-        })
-        if status_resp.get("success"):
-            data = status_resp.get("data") or {}
-            if isinstance(data, dict):
-                status_value = data.get("status")
-                if status_value == "success":
-                    return {
-                        "success": True,
-                        "status": 200,
-                        "data": data.get("response", data),
-                    }
-                if status_value == "failed":
-                    return {
-                        "success": False,
-                        "status": 500,
-                        "error": str(data.get("error") or "AI request failed"),
-                        "data": data,
-                    }
-        else:
-            return status_resp
+def _poll_result(status_resp: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the final result for a status response, or None to keep polling."""
+    if not status_resp.get("success"):
+        return status_resp
 
-        if time.time() >= deadline:
+    data = status_resp.get("data") or {}
+    if isinstance(data, dict):
+        status_value = data.get("status")
+        if status_value == "success":
+            return {
+                "success": True,
+                "status": 200,
+                "data": data.get("response", data),
+            }
+        if status_value == "failed":
             return {
                 "success": False,
-                "error": "timeout",
-                "message": "Timed out waiting for AI response.",
+                "status": 500,
+                "error": str(data.get("error") or "AI request failed"),
+                "data": data,
             }
-        time.sleep(interval)
+    return None
+
+
+def _poll_timeout_result() -> Dict[str, Any]:
+    return {
+        "success": False,
+        "error": "timeout",
+        "message": "Timed out waiting for AI response.",
+    }
 
 
 def extract_text(response: Dict[str, Any]) -> str:
@@ -249,26 +566,30 @@ def decode_json_from_response(response: Dict[str, Any]) -> Optional[Dict[str, An
         return None
 
     try:
-        decoded = json.loads(text)
+        decoded = _loads(text)
         if isinstance(decoded, dict):
             return decoded
-    except json.JSONDecodeError:
+    except ValueError:
         pass
 
-    stripped = text.strip()
-    if stripped.startswith("```json"):
-        stripped = stripped[7:]
-    if stripped.endswith("```"):
-        stripped = stripped[:-3]
-    stripped = stripped.strip()
-    if stripped and stripped != text:
+    match = _JSON_FENCE_RE.search(text)
+    if match:
         try:
-            decoded = json.loads(stripped)
+            decoded = _loads(match.group(1))
             if isinstance(decoded, dict):
                 return decoded
-        except json.JSONDecodeError:
-            return None
-    return None
+        except ValueError:
+            pass
+
+    # Fall back to the first JSON object embedded in surrounding prose.
+    start = text.find("{")
+    if start == -1:
+        return None
+    try:
+        decoded, _ = _JSON_DECODER.raw_decode(text, start)
+    except ValueError:
+        return None
+    return decoded if isinstance(decoded, dict) else None
 
 
 def _extract_text(response: Dict[str, Any]) -> str:
@@ -276,15 +597,17 @@ def _extract_text(response: Dict[str, Any]) -> str:
     if isinstance(payload, dict):
         output = payload.get("output")
         if isinstance(output, list):
-            combined = ""
             for item in output:
                 content = item.get("content") if isinstance(item, dict) else None
-                if isinstance(content, list):
-                    for block in content:
-                        if isinstance(block, dict) and block.get("type") == "output_text" and block.get("text"):
-                            combined += str(block["text"])
-                if combined:
-                    return combined
+                if not isinstance(content, list):
+                    continue
+                parts = [
+                    str(block["text"])
+                    for block in content
+                    if isinstance(block, dict) and block.get("type") == "output_text" and block.get("text")
+                ]
+                if parts:
+                    return "".join(parts)
         choices = payload.get("choices")
         if isinstance(choices, list) and choices:
             message = choices[0].get("message")
@@ -295,11 +618,120 @@ def _extract_text(response: Dict[str, Any]) -> str:
     return ""
 
 
-def _config() -> Dict[str, Any]:
-    global _CONFIG_CACHE  # noqa: PLW0603
-    if _CONFIG_CACHE is not None:
-        return _CONFIG_CACHE
+def _cache_key(payload: Dict[str, Any], options: Dict[str, Any]) -> Optional[str]:
+    """Key on everything that shapes the proxy call: payload, endpoint, headers and TLS mode."""
+    cfg = _config()
+    return _canonical_hash({
+        "payload": payload,
+        # request() fills project_uuid in only when the caller did not set one.
+        "project_uuid": cfg["project_uuid"],
+        "path": options.get("path") or cfg["responses_path"],
+        "headers": _parse_headers(options.get("headers")),
+        "verify_tls": _resolve_verify_tls(options.get("verify_tls"), cfg),
+    })
+
+
+def _canonical_hash(value: Any) -> Optional[str]:
+    try:
+        canonical = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    except (TypeError, ValueError):
+        # Mixed-type keys cannot be sorted; such payloads are simply not cached.
+        return None
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _semantic_cache_enabled(options: Dict[str, Any]) -> bool:
+    if options.get("no_cache") or options.get("cache_bypass"):
+        return False
+    return bool(options.get("semantic_cache", _config()["semantic_cache"]))
+
+
+def _semantic_key(payload: Dict[str, Any],
+                  options: Dict[str, Any]) -> Optional[Tuple[str, semantic_cache.Vector]]:
+    """Embed the wording of the latest user turn; everything else must match via the namespace."""
+    cache = semantic_cache.default_cache()
+    if not cache.enabled:
+        return None
+
+    messages = payload["input"]
+    last_user = next((
+        index for index in range(len(messages) - 1, -1, -1)
+        if isinstance(messages[index], dict) and messages[index].get("role") == "user"
+    ), None)
+    if last_user is None:
+        return None
+
+    text, attachments = _split_user_content(messages[last_user].get("content"))
+    # Earlier turns, where the latest user turn sits and any images or files
+    # attached to it must match exactly; only its text is compared by similarity.
+    context = list(messages)
+    context[last_user] = {**messages[last_user], "content": attachments}
+    namespace = _cache_key({**payload, "input": context}, options)
+    if namespace is None:
+        return None
+    vector = cache.embed(text)
+    if vector is None:
+        return None
+    return namespace, vector
+
+
+def _split_user_content(content: Any) -> Tuple[str, Any]:
+    """Split message content into its text and the remaining (non-text) blocks."""
+    if isinstance(content, str):
+        return content, []
+    if not isinstance(content, list):
+        return "", content
+    texts = []
+    others = []
+    for block in content:
+        if isinstance(block, dict) and block.get("type") in _TEXT_BLOCK_TYPES and isinstance(block.get("text"), str):
+            texts.append(block["text"])
+        else:
+            others.append(block)
+    return "\n".join(texts), others
+
 
+def _cache_get(key: str) -> Optional[Dict[str, Any]]:
+    with _RESPONSE_CACHE_LOCK:
+        entry = _RESPONSE_CACHE.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.time():
+            del _RESPONSE_CACHE[key]
+            return None
+    return copy.deepcopy(result)
+
+
+def _cache_put(key: str, result: Dict[str, Any], ttl: int) -> None:
+    stored = copy.deepcopy(result)
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE.pop(key, None)
+        while len(_RESPONSE_CACHE) >= _RESPONSE_CACHE_MAX_ENTRIES:
+            del _RESPONSE_CACHE[next(iter(_RESPONSE_CACHE))]
+        _RESPONSE_CACHE[key] = (time.time() + ttl, stored)
+
+
+def _has_tool_calls(result: Dict[str, Any]) -> bool:
+    payload = result.get("data")
+    if not isinstance(payload, dict):
+        return False
+    output = payload.get("output")
+    if isinstance(output, list):
+        for item in output:
+            if isinstance(item, dict) and str(item.get("type", "")).endswith("_call"):
+                return True
+    choices = payload.get("choices")
+    if isinstance(choices, list) and choices and isinstance(choices[0], dict):
+        message = choices[0].get("message")
+        if isinstance(message, dict) and message.get("tool_calls"):
+            return True
+    return False
+
+
+@functools.cache
+def _config() -> Mapping[str, Any]:
+    """Resolve proxy settings once per process; the result is read-only."""
     _ensure_env_loaded()
 
     base_url = os.getenv("AI_PROXY_BASE_URL", "https://flatlogic.com")
@@ -308,7 +740,7 @@ def _config() -> Dict[str, Any]:
     if not responses_path and project_id:
         responses_path = f"/projects/{project_id}/ai-request"
 
-    _CONFIG_CACHE = {
+    return MappingProxyType({
         "base_url": base_url,
         "responses_path": responses_path,
         "project_id": project_id,
@@ -316,9 +748,68 @@ def _config() -> Dict[str, Any]:
         "project_header": os.getenv("AI_PROJECT_HEADER", "project-uuid"),
         "default_model": os.getenv("AI_DEFAULT_MODEL", "gpt-5-mini"),
         "timeout": int(os.getenv("AI_TIMEOUT", "30")),
+        "status_wait": int(os.getenv("AI_STATUS_WAIT", "0")),
+        "semantic_cache": os.getenv("AI_SEMANTIC_CACHE", "false").lower() in {"1", "true", "yes"},
         "verify_tls": os.getenv("AI_VERIFY_TLS", "true").lower() not in {"0", "false", "no"},
+    })
+
+
+@functools.cache
+def _base_headers(with_body: bool) -> Mapping[str, str]:
+    cfg = _config()
+    headers = {
+        "Accept": "application/json",
+        cfg["project_header"]: cfg["project_uuid"] or "",
     }
-    return _CONFIG_CACHE
+    if with_body:
+        headers = {"Content-Type": "application/json", **headers}
+    return MappingProxyType(headers)
+
+
+def _parse_headers(extra_headers: Any) -> Dict[str, str]:
+    """Accept a header dict or the deprecated list of "Name: value" strings."""
+    if not extra_headers:
+        return {}
+    if isinstance(extra_headers, Mapping):
+        return dict(extra_headers)
+    warnings.warn(
+        'Passing options["headers"] as a list of "Name: value" strings is deprecated; '
+        "pass a dict of header names to values instead.",
+        DeprecationWarning,
+        stacklevel=3,
+    )
+    parsed: Dict[str, str] = {}
+    if isinstance(extra_headers, Iterable):
+        for header in extra_headers:
+            if isinstance(header, str) and ":" in header:
+                name, value = header.split(":", 1)
+                parsed[name.strip()] = value.strip()
+    return parsed
+
+
+def _merge_headers(base: Mapping[str, str], extra_headers: Any) -> Mapping[str, str]:
+    if not extra_headers:
+        return base
+    if not isinstance(extra_headers, Mapping):
+        extra_headers = _parse_headers(extra_headers)
+    return {**base, **extra_headers}
+
+
+def _call_timeout(opt_timeout: Any, cfg: Mapping[str, Any]) -> int:
+    return int(cfg["timeout"] if opt_timeout is None else opt_timeout)
+
+
+def _status_call_timeout(opt_timeout: Any, cfg: Mapping[str, Any]) -> int:
+    """Per-call timeout for status checks; long-polls must outlast the server-side wait."""
+    timeout = _call_timeout(opt_timeout, cfg)
+    if cfg["status_wait"] > 0:
+        timeout = max(timeout, cfg["status_wait"] + 5)
+    return timeout
+
+
+def _resolve_verify_tls(value: Any, cfg: Mapping[str, Any]) -> bool:
+    """Treat a missing or None option as the configured AI_VERIFY_TLS default."""
+    return bool(cfg["verify_tls"]) if value is None else bool(value)
 
 
 def _build_url(path: str, base_url: str) -> str:
@@ -330,7 +821,7 @@ def _build_url(path: str, base_url: str) -> str:
     return f"{base_url}/{trimmed}"
 
 
-def _resolve_status_path(ai_request_id: Any, cfg: Dict[str, Any]) -> str:
+def _resolve_status_path(ai_request_id: Any, cfg: Mapping[str, Any]) -> str:
     base_path = (cfg.get("responses_path") or "").rstrip("/")
     if not base_path:
         return f"/ai-request/{ai_request_id}/status"
@@ -339,28 +830,37 @@ def _resolve_status_path(ai_request_id: Any, cfg: Dict[str, Any]) -> str:
     return f"{base_path}/{ai_request_id}/status"
 
 
-def _http_request(url: str, method: str, body: Optional[bytes], headers: Dict[str, str],
+def _http_request(url: str, method: str, body: Optional[bytes], headers: Mapping[str, str],
                   timeout: int, verify_tls: bool) -> Dict[str, Any]:
     """
     Shared HTTP helper for GET/POST requests.
-    """
-    req = urlrequest.Request(url, data=body, method=method.upper())
-    for name, value in headers.items():
-        req.add_header(name, value)
 
-    context = None
-    if not verify_tls:
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
+    Connections are kept alive per thread and reused across calls, so the
+    status polling loop does not pay a TCP/TLS handshake on every check.
+    Redirects, the default User-Agent and proxy credentials are handled the
+    way urllib.request.urlopen handled them.
+    """
+    # Never let a missing option fall through to an unverified TLS context.
+    verify_tls = _resolve_verify_tls(verify_tls, _config())
+    method = method.upper()
+    if not any(name.lower() == "user-agent" for name in headers):
+        headers = {**headers, "User-Agent": _USER_AGENT}
 
     try:
-        with urlrequest.urlopen(req, timeout=timeout, context=context) as resp:
-            status = resp.getcode()
-            response_body = resp.read().decode("utf-8", errors="replace")
-    except urlerror.HTTPError as exc:
-        status = exc.getcode()
-        response_body = exc.read().decode("utf-8", errors="replace")
+        for _ in range(_MAX_REDIRECTS + 1):
+            status, location, raw_body = _send_request(url, method, body, headers, timeout, verify_tls)
+            if status not in _REDIRECT_CODES or not location:
+                break
+            if method == "POST" and status in {301, 302, 303}:
+                # Same rule as urllib: re-issue as a GET without the body.
+                method, body = "GET", None
+                headers = {
+                    name: value for name, value in headers.items()
+                    if name.lower() not in {"content-type", "content-length"}
+                }
+            elif method not in {"GET", "HEAD"}:
+                break
+            url = urljoin(url, location)
     except Exception as exc:  # pylint: disable=broad-except
         return {
             "success": False,
@@ -369,11 +869,13 @@ def _http_request(url: str, method: str, body: Optional[bytes], headers: Dict[st
         }
 
     decoded = None
-    if response_body:
+    if raw_body:
         try:
-            decoded = json.loads(response_body)
-        except json.JSONDecodeError:
+            decoded = _loads(raw_body)
+        except ValueError:
             decoded = None
+    # Only fall back to text when the body is not JSON (or for error messages below).
+    response_body = "" if decoded is not None else raw_body.decode("utf-8", errors="replace")
 
     if 200 <= status < 300:
         return {
@@ -385,8 +887,8 @@ def _http_request(url: str, method: str, body: Optional[bytes], headers: Dict[st
     error_message = "AI proxy request failed"
     if isinstance(decoded, dict):
         error_message = decoded.get("error") or decoded.get("message") or error_message
-    elif response_body:
-        error_message = response_body
+    elif raw_body:
+        error_message = response_body or raw_body.decode("utf-8", errors="replace")
 
     return {
         "success": False,
@@ -396,8 +898,114 @@ def _http_request(url: str, method: str, body: Optional[bytes], headers: Dict[st
     }
 
 
+def _send_request(url: str, method: str, body: Optional[bytes], headers: Mapping[str, str],
+                  timeout: int, verify_tls: bool) -> Tuple[int, Optional[str], bytes]:
+    """Send one request over a pooled connection; returns (status, Location, body)."""
+    parts = urlsplit(url)
+    if parts.scheme not in {"http", "https"} or not parts.hostname:
+        raise ValueError(f"Unsupported AI proxy URL: {url}")
+
+    proxy = _proxy_for(parts)
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    if proxy is not None and parts.scheme == "http":
+        target = url
+        proxy_auth = _proxy_authorization(proxy)
+        if proxy_auth:
+            headers = {**headers, "Proxy-Authorization": proxy_auth}
+
+    pool_key = (parts.scheme, parts.netloc, verify_tls, proxy)
+    attempts = 2
+    while True:
+        attempts -= 1
+        conn, reused = _pooled_connection(pool_key, parts, proxy, timeout, verify_tls)
+        try:
+            conn.request(method, target, body=body, headers=headers)
+            resp = conn.getresponse()
+            raw_body = resp.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            _discard_connection(pool_key)
+            if reused and attempts > 0:
+                # The server closed an idle keep-alive socket; retry on a fresh one.
+                continue
+            raise
+        except Exception:
+            _discard_connection(pool_key)
+            raise
+        if resp.will_close:
+            _discard_connection(pool_key)
+        return resp.status, resp.getheader("Location"), raw_body
+
+
+def _proxy_for(parts: SplitResult) -> Optional[str]:
+    proxy = urlrequest.getproxies().get(parts.scheme)
+    if not proxy or urlrequest.proxy_bypass(parts.hostname or ""):
+        return None
+    return proxy if "://" in proxy else f"http://{proxy}"
+
+
+def _proxy_authorization(proxy: str) -> Optional[str]:
+    proxy_parts = urlsplit(proxy)
+    if not (proxy_parts.username and proxy_parts.password):
+        return None
+    credentials = f"{unquote(proxy_parts.username)}:{unquote(proxy_parts.password)}"
+    return "Basic " + base64.b64encode(credentials.encode()).decode("ascii")
+
+
+def _pooled_connection(pool_key: Tuple[Any, ...], parts: SplitResult, proxy: Optional[str],
+                       timeout: int, verify_tls: bool) -> Tuple[http.client.HTTPConnection, bool]:
+    pool = _CONNECTIONS.__dict__.setdefault("pool", {})
+    conn = pool.get(pool_key)
+    if conn is not None:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    if proxy is not None:
+        proxy_parts = urlsplit(proxy)
+        host, port = proxy_parts.hostname or "", proxy_parts.port
+    else:
+        host, port = parts.hostname or "", parts.port
+
+    if parts.scheme == "https":
+        conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=_ssl_context(verify_tls))
+        if proxy is not None:
+            proxy_auth = _proxy_authorization(proxy)
+            tunnel_headers = {"Proxy-Authorization": proxy_auth} if proxy_auth else None
+            conn.set_tunnel(parts.hostname or "", parts.port, headers=tunnel_headers)
+    else:
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    pool[pool_key] = conn
+    return conn, False
+
+
+@functools.cache
+def _ssl_context(verify_tls: bool) -> ssl.SSLContext:
+    """Build each TLS context once; loading the CA bundle is the expensive part."""
+    context = ssl.create_default_context()
+    if not verify_tls:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def _discard_connection(pool_key: Tuple[Any, ...]) -> None:
+    pool = _CONNECTIONS.__dict__.get("pool", {})
+    conn = pool.pop(pool_key, None)
+    if conn is not None:
+        conn.close()
+
+
 def _ensure_env_loaded() -> None:
     """Populate os.environ from executor/.env if variables are missing."""
+    global _ENV_LOADED  # noqa: PLW0603
+    if _ENV_LOADED:
+        return
+    _ENV_LOADED = True
+
     if os.getenv("PROJECT_UUID") and os.getenv("PROJECT_ID"):
         return
 
@@ -408,13 +1016,14 @@ def _ensure_env_loaded() -> None:
     try:
         with open(env_path, "r", encoding="utf-8") as handle:
             for line in handle:
-                stripped = line.strip()
-                if not stripped or stripped.startswith("#") or "=" not in stripped:
+                line = line.strip()
+                if not line or line[0] == "#":
+                    continue
+                key, sep, value = line.partition("=")
+                if not sep:
                     continue
-                key, value = stripped.split("=", 1)
                 key = key.strip()
-                value = value.strip().strip('\'"')
-                if key and not os.getenv(key):
-                    os.environ[key] = value
+                if key and not os.environ.get(key):
+                    os.environ[key] = _ENV_QUOTE_RE.sub("", value.strip())
     except OSError:
         pass
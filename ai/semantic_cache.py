@@ -0,0 +1,109 @@
+"""
+Semantic response cache for the Flatlogic AI proxy client.
+
+Prompts that differ only in phrasing ("summarise this", "tl;dr", "give me a
+summary") are matched by cosine similarity of their embeddings, so the
+cached response is returned without another round-trip to the proxy.
+
+The cache is opt-in (``{"semantic_cache": True}`` in create_response options
+or AI_SEMANTIC_CACHE=true). Embeddings come from sentence-transformers
+(AI_SEMANTIC_CACHE_MODEL, default all-MiniLM-L6-v2) when it is installed;
+without it the cache is disabled and every lookup misses. A custom embedder
+can be supplied to SemanticCache directly.
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+__all__ = ["SemanticCache", "default_cache"]
+
+Vector = Tuple[float, ...]
+Embedder = Callable[[str], Sequence[float]]
+
+_DEFAULT_MODEL = "all-MiniLM-L6-v2"
+_DEFAULT_MAX_ENTRIES = 256
+
+_DEFAULT_CACHE: Optional["SemanticCache"] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+class SemanticCache:
+    """In-process nearest-neighbour cache keyed by namespace and embedding."""
+
+    def __init__(self, embedder: Optional[Embedder] = None, max_entries: int = _DEFAULT_MAX_ENTRIES) -> None:
+        self._embedder = embedder
+        self._max_entries = max_entries
+        self._entries: List[Tuple[str, Vector, float, Dict[str, Any]]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._embedder is not None
+
+    def embed(self, text: str) -> Optional[Vector]:
+        """Return the unit-length embedding of ``text`` or None if embedding is unavailable."""
+        if self._embedder is None or not text:
+            return None
+        vector = [float(value) for value in self._embedder(text)]
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm == 0:
+            return None
+        return tuple(value / norm for value in vector)
+
+    def get(self, namespace: str, vector: Vector, threshold: float) -> Optional[Dict[str, Any]]:
+        """Return a copy of the closest cached result with cosine >= threshold."""
+        now = time.time()
+        best: Optional[Dict[str, Any]] = None
+        best_score = threshold
+        with self._lock:
+            self._entries = [entry for entry in self._entries if entry[2] > now]
+            for entry_namespace, entry_vector, _, result in self._entries:
+                if entry_namespace != namespace or len(entry_vector) != len(vector):
+                    continue
+                score = sum(a * b for a, b in zip(entry_vector, vector))
+                if score >= best_score:
+                    best, best_score = result, score
+        return copy.deepcopy(best) if best is not None else None
+
+    def put(self, namespace: str, vector: Vector, result: Dict[str, Any], ttl: int) -> None:
+        stored = copy.deepcopy(result)
+        with self._lock:
+            if len(self._entries) >= self._max_entries:
+                del self._entries[: len(self._entries) - self._max_entries + 1]
+            self._entries.append((namespace, vector, time.time() + ttl, stored))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def default_cache() -> SemanticCache:
+    """Process-wide cache backed by sentence-transformers when it is installed."""
+    global _DEFAULT_CACHE  # noqa: PLW0603
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = SemanticCache(_load_default_embedder())
+        return _DEFAULT_CACHE
+
+
+def _load_default_embedder() -> Optional[Embedder]:
+    try:
+        from sentence_transformers import SentenceTransformer  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+
+    try:
+        model = SentenceTransformer(os.getenv("AI_SEMANTIC_CACHE_MODEL", _DEFAULT_MODEL))
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+    def embed(text: str) -> Sequence[float]:
+        return model.encode(text).tolist()
+
+    return embed
@@ -1,13 +1,20 @@
 import os
 import time
 
+# Resolved once per process: the environment does not change between requests,
+# and a per-process timestamp busts static caches on deploy without changing
+# the asset URLs every second.
+_PROJECT_DESCRIPTION = os.getenv("PROJECT_DESCRIPTION", "")
+_PROJECT_IMAGE_URL = os.getenv("PROJECT_IMAGE_URL", "")
+_DEPLOYMENT_TIMESTAMP = int(time.time())
+
 def project_context(request):
     """
     Adds project-specific environment variables to the template context globally.
     """
     return {
-        "project_description": os.getenv("PROJECT_DESCRIPTION", ""),
-        "project_image_url": os.getenv("PROJECT_IMAGE_URL", ""),
+        "project_description": _PROJECT_DESCRIPTION,
+        "project_image_url": _PROJECT_IMAGE_URL,
         # Used for cache-busting static assets
-        "deployment_timestamp": int(time.time()),
+        "deployment_timestamp": _DEPLOYMENT_TIMESTAMP,
     }
@@ -1,3 +1,53 @@
-from django.test import TestCase
+import re
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+from . import context_processors, views
+
+
+class ProjectContextTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _asset_version(self):
+        response = self.client.get("/")
+        return re.search(r"custom\.css\?v=(\d+)", response.content.decode()).group(1)
+
+    def test_deployment_timestamp_is_stable_across_renders(self):
+        first = self._asset_version()
+        with mock.patch.object(context_processors.time, "time", return_value=time.time() + 120):
+            second = self._asset_version()
+
+        self.assertEqual(first, second)
+        self.assertEqual(first, str(context_processors._DEPLOYMENT_TIMESTAMP))
+
+
+@override_settings(ALLOWED_HOSTS=["appwizzy.com", "example.com"])
+class HomeCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_response_is_cached_for_a_minute(self):
+        response = self.client.get("/", HTTP_HOST="example.com")
+
+        self.assertIn("max-age=60", response["Cache-Control"])
+
+    def _rendered_time(self, host):
+        content = self.client.get("/", HTTP_HOST=host).content.decode()
+        return re.search(r"UTC <code>([^<]+)</code>", content).group(1)
+
+    def test_hosts_are_cached_separately(self):
+        now = timezone.now()
+        with mock.patch.object(views.timezone, "now", return_value=now):
+            appwizzy = self._rendered_time("appwizzy.com")
+        with mock.patch.object(views.timezone, "now", return_value=now + timedelta(seconds=30)):
+            repeat = self._rendered_time("appwizzy.com")
+            other = self._rendered_time("example.com")
+
+        self.assertEqual(repeat, appwizzy)
+        self.assertNotEqual(other, appwizzy)
@@ -1,13 +1,22 @@
-import os
 import platform
 
 from django import get_version as django_version
 from django.shortcuts import render
 from django.utils import timezone
+from django.views.decorators.cache import cache_page
 
+# Fixed for the lifetime of the process.
+_DJANGO_VERSION = django_version()
+_PYTHON_VERSION = platform.python_version()
 
+
+@cache_page(60)
 def home(request):
-    """Render the landing screen with loader and environment details."""
+    """Render the landing screen with loader and environment details.
+
+    The response is cached per host for 60 seconds, so the rendered UTC time
+    can lag the request by up to a minute.
+    """
     host_name = request.get_host().lower()
     agent_brand = "AppWizzy" if host_name == "appwizzy.com" else "Flatlogic"
     now = timezone.now()
@@ -15,11 +24,9 @@ def home(request):
     context = {
         "project_name": "New Style",
         "agent_brand": agent_brand,
-        "django_version": django_version(),
-        "python_version": platform.python_version(),
+        "django_version": _DJANGO_VERSION,
+        "python_version": _PYTHON_VERSION,
         "current_time": now,
         "host_name": host_name,
-        "project_description": os.getenv("PROJECT_DESCRIPTION", ""),
-        "project_image_url": os.getenv("PROJECT_IMAGE_URL", ""),
     }
     return render(request, "core/index.html", context)